@@ -1,9 +1,11 @@
+import math
 import warnings
 
 import gsw
 import numpy as np
 import xarray as xr
 import xgcm
+from numba import boolean, float32, float64, guvectorize
 
 def hlamdot_from_Jlam(grid, Jlam, dim):
     """
@@ -14,11 +16,11 @@ def hlamdot_from_Jlam(grid, Jlam, dim):
     dJlam = -grid.diff(Jlam, dim)
     if "Z_metrics" in list(vars(grid)):
         h = grid.Z_metrics["center"]
-        h = h.where(h!=0.)
     else:
         h = grid.get_metric(dJlam, "Z")
-    lamdot = dJlam/h
-    hlamdot = h.fillna(0.)*lamdot.fillna(0.)
+    # Equivalent to h * (dJlam / h) with missing values and vanishing layers
+    # set to zero, but in a single pass
+    hlamdot = xr.where(h.fillna(0.) != 0., dJlam.fillna(0.), 0.)
     return hlamdot
 
 def calc_hlamdot_tendency(grid, datadict):
@@ -34,4 +36,154 @@ def calc_hlamdot_tendency(grid, datadict):
             grid,
             datadict["interfacial_flux"],
             "Z"
-        )
\ No newline at end of file
+        )
+
+def calc_density_terms(s, t, p, p_ref, lon=None, lat=None, s_var="absolute", t_var="conservative", density_name=None):
+    """
+    Fused TEOS-10 equation of state: derive absolute salinity, conservative temperature,
+    thermal expansion and haline contraction coefficients (at reference pressure `p_ref`)
+    and, optionally, potential density in a single pass over each block of data.
+
+    Intended to be applied with `xr.apply_ufunc(..., dask="parallelized")`, so that the
+    intermediate `sa` and `ct` arrays are reused within a block instead of being written
+    out and re-read by separate tasks. Longitude `lon` and latitude `lat` are only needed
+    (and should only be passed) for the conversion from practical salinity.
+
+    Returns
+    -------
+    sa, ct, alpha, beta[, sigma] : np.ndarray
+    """
+    sa = gsw.SA_from_SP(s, p, lon, lat) if s_var == "practical" else s
+    ct = gsw.CT_from_t(sa, t, p) if t_var == "potential" else t
+    terms = (sa, ct, gsw.alpha(sa, ct, p_ref), gsw.beta(sa, ct, p_ref))
+    if density_name is not None:
+        terms += (getattr(gsw, density_name)(sa, ct),)
+    return terms
+
+@guvectorize(
+    [
+        (float64[:], float64[:], float64[:], float64[:], float64[:], boolean, float64[:]),
+        (float32[:], float32[:], float32[:], float32[:], float32[:], boolean, float32[:]),
+    ],
+    "(n),(n),(n),(m),(m),()->(m)",
+    nopython=True,
+    target="cpu",
+)
+def _rebin_conservative(phi, lam_1, lam_2, bins_1, bins_2, uniform, output):
+    """
+    Column kernel for `transform_conservative`. Rather than testing every cell against
+    every bin, the range of bins overlapped by each cell is located by bisection of the
+    (increasing) bin edges, so that the cost is O(n log m) instead of O(n m). For
+    uniformly-spaced bins, the range is instead computed directly from the bin width
+    (and corrected for round-off), in O(1) per cell.
+
+    Compiled for numba's serial "cpu" target: parallelism comes from dask, which calls
+    the kernel on several chunks at once.
+    """
+    output[:] = np.nan
+    m = len(bins_1)
+    dbin = bins_2[0] - bins_1[0]
+    for i in range(len(phi)):
+        # missing values in phi need to be excluded or the whole bin will be NaN
+        if np.isnan(phi[i]) or (np.isnan(lam_1[i]) and np.isnan(lam_2[i])):
+            continue
+        # assume lambda is homogeneous over cells with a single valid bound
+        elif np.isnan(lam_1[i]):
+            lam_min = lam_max = lam_2[i]
+        elif np.isnan(lam_2[i]):
+            lam_min = lam_max = lam_1[i]
+        # handle non-monotonic stratification
+        elif lam_1[i] < lam_2[i]:
+            lam_min, lam_max = lam_1[i], lam_2[i]
+        else:
+            lam_min, lam_max = lam_2[i], lam_1[i]
+
+        # bins j overlapping the cell satisfy bins_2[j] >= lam_min and bins_1[j] <= lam_max
+        if uniform:
+            j_start = min(max(int(math.floor((lam_min - bins_1[0]) / dbin)), 0), m)
+            while j_start > 0 and bins_2[j_start-1] >= lam_min:
+                j_start -= 1
+            while j_start < m and bins_2[j_start] < lam_min:
+                j_start += 1
+            j_end = min(max(int(math.floor((lam_max - bins_1[0]) / dbin)) + 1, 0), m)
+            while j_end > 0 and bins_1[j_end-1] > lam_max:
+                j_end -= 1
+            while j_end < m and bins_1[j_end] <= lam_max:
+                j_end += 1
+        else:
+            j_start = np.searchsorted(bins_2, lam_min, side="left")
+            j_end = np.searchsorted(bins_1, lam_max, side="right")
+        for j in range(j_start, j_end):
+            if lam_max == lam_min:
+                weight = 1.
+            else:
+                weight = (
+                    (min(lam_max, bins_2[j]) - max(lam_min, bins_1[j])) /
+                    (lam_max - lam_min)
+                )
+            if np.isnan(output[j]):
+                output[j] = weight * phi[i]
+            else:
+                output[j] += weight * phi[i]
+
+def _transform_conservative(phi, lam_i, bins, uniform=False):
+    return _rebin_conservative(phi, lam_i[..., :-1], lam_i[..., 1:], bins[:-1], bins[1:], uniform)
+
+def rechunk_contiguous(da, dim):
+    """
+    Rechunk `da` into a single chunk along `dim`, only if it is dask-backed and split
+    into more than one chunk along `dim` (otherwise `da` is returned unchanged).
+    """
+    if da.chunks is not None and dim in da.dims and len(da.chunks[da.get_axis_num(dim)]) > 1:
+        return da.chunk({dim: -1})
+    return da
+
+def transform_conservative(grid, da, target, target_data):
+    """
+    Conservatively transform an extensive cell-centered quantity `da` into the bins
+    of lambda defined by the edges `target`, given lambda (`target_data`) on the
+    cell interfaces.
+
+    Equivalent to `grid.transform(da, "Z", target, target_data=target_data, method="conservative")`,
+    but using a column kernel that only visits the bins overlapped by each cell.
+    """
+    z_center = grid.axes['Z'].coords['center']
+    z_outer = grid.axes['Z'].coords['outer']
+
+    bins = np.asarray(target)
+    bins_diff = np.diff(bins)
+    if np.all(bins_diff < 0):
+        flip = True
+        bins = bins[::-1]
+    elif np.all(bins_diff > 0):
+        flip = False
+    else:
+        raise ValueError("Target values are not monotonic")
+
+    # The column kernel needs each column in a single chunk
+    da = rechunk_contiguous(da, z_center)
+    target_data = rechunk_contiguous(target_data, z_outer)
+
+    # The kernel runs in (and returns) the common precision of the inputs
+    dtype = np.result_type(da.dtype, target_data.dtype)
+    out = xr.apply_ufunc(
+        _transform_conservative,
+        da,
+        target_data,
+        kwargs={
+            "bins": bins.astype(dtype),
+            "uniform": bool(np.allclose(bins_diff, bins_diff[0], rtol=1e-6, atol=0.)),
+        },
+        input_core_dims=[[z_center], [z_outer]],
+        output_core_dims=[["remapped"]],
+        dask="parallelized",
+        dask_gufunc_kwargs={"output_sizes": {"remapped": len(bins) - 1}},
+        output_dtypes=[dtype],
+    )
+    if flip:
+        out = out.isel({"remapped": slice(None, None, -1)})
+        bins = bins[::-1]
+    return (
+        out.rename({"remapped": target_data.name})
+        .assign_coords({target_data.name: (bins[1:] + bins[:-1]) / 2})
+    )
@@ -68,6 +68,44 @@ class Helpers:
         T = T.assign_coords({'temperature_i_target': xr.DataArray(bins, dims=("temperature_i_target",))})
         return T
     
+    # Small 3-D dataset with heat and salt tendencies, surface fluxes, and grid metrics
+    def idealized_dataset(self, Nx=4, Ny=3, Nz=6, Nt=2, seed=0):
+        rng = np.random.default_rng(seed)
+        z_i = np.linspace(0., 60., Nz+1)
+        ds = xr.Dataset(coords={
+            'time': np.arange(Nt),
+            'xh': np.arange(Nx, dtype=float),
+            'yh': np.arange(Ny, dtype=float),
+            'zl': 0.5*(z_i[1:] + z_i[:-1]),
+            'zi': z_i,
+        })
+        dims = ('time', 'zl', 'yh', 'xh')
+        shape = (Nt, Nz, Ny, Nx)
+        ds['thetao'] = xr.DataArray(10. + 5*rng.random(shape) - np.linspace(0., 4., Nz)[None, :, None, None], dims=dims)
+        ds['so'] = xr.DataArray(34. + rng.random(shape) + np.linspace(0., 1., Nz)[None, :, None, None], dims=dims)
+        ds['thkcello'] = xr.DataArray(np.broadcast_to(np.diff(z_i)[None, :, None, None], shape).copy(), dims=dims)
+        ds['areacello'] = xr.DataArray(1.e6*(1 + rng.random((Ny, Nx))), dims=('yh', 'xh'))
+        ds['lat'] = xr.DataArray(np.broadcast_to(np.linspace(50., 60., Ny)[:, None], (Ny, Nx)).copy(), dims=('yh', 'xh'))
+        ds['lon'] = xr.DataArray(np.broadcast_to(np.linspace(10., 20., Nx)[None, :], (Ny, Nx)).copy(), dims=('yh', 'xh'))
+        ds['opottemptend'] = xr.DataArray(rng.standard_normal(shape), dims=dims)
+        ds['osalttend'] = xr.DataArray(1.e-6*rng.standard_normal(shape), dims=dims)
+        ds['hfds'] = xr.DataArray(100*rng.standard_normal((Nt, Ny, Nx)), dims=('time', 'yh', 'xh'))
+        budgets_dict = {
+            'mass': {'thickness': 'thkcello', 'lhs': {}, 'rhs': {}},
+            'heat': {'lambda': 'thetao', 'lhs': {'tendency': 'opottemptend'}, 'rhs': {'boundary_forcing': 'hfds'}},
+            'salt': {'lambda': 'so', 'lhs': {'tendency': 'osalttend'}, 'rhs': {}},
+        }
+        return ds, budgets_dict
+
+    def idealized_grid(self, ds):
+        return xgcm.Grid(
+            ds,
+            coords={'X': {'center': 'xh'}, 'Y': {'center': 'yh'}, 'Z': {'center': 'zl', 'outer': 'zi'}},
+            metrics={('X', 'Y'): "areacello"},
+            boundary={'X': 'extend', 'Y': 'extend', 'Z': 'extend'},
+            autoparse_metadata=False
+        )
+
     def mean_absolute_relative_errors(self, wmt_xwmt, wmt_local_exact, wmt_layer_exact):
         def absolute_relative_errors(wmt, wmt_ref):
             return np.abs((wmt - wmt_ref)/wmt_ref).where(np.abs(wmt_ref)>1.e-5).mean(skipna=True).values
@@ -0,0 +1,21 @@
+import pytest
+import numpy as np
+import xwmt
+
+@pytest.mark.parametrize("lambda_name, bins", [
+    ("heat", np.linspace(0., 20., 11)),
+    ("sigma0", np.linspace(20., 30., 21)),
+])
+def test_z_chunked_input(helpers, lambda_name, bins):
+    pytest.importorskip("dask")
+    ds, budgets_dict = helpers.idealized_dataset()
+    expected = xwmt.WaterMassTransformations(
+        helpers.idealized_grid(ds), budgets_dict, method="xgcm"
+    ).map_transformations(lambda_name, bins=bins, group_processes=True)
+    result = xwmt.WaterMassTransformations(
+        helpers.idealized_grid(ds.chunk({"time": 1, "zl": 2, "zi": 3})), budgets_dict, method="xgcm"
+    ).map_transformations(lambda_name, bins=bins, group_processes=True)
+    assert set(result.data_vars) == set(expected.data_vars)
+    for name in expected.data_vars:
+        assert result[name].chunks is not None
+        np.testing.assert_allclose(result[name].values, expected[name].values, rtol=1e-10)
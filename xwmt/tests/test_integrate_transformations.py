@@ -20,6 +20,9 @@ metrics = {
 grid = xgcm.Grid(ds, coords=coords, metrics=metrics, periodic=None, autoparse_metadata=False)
 wmt = xwmt.WaterMassTransformations(grid, simple_budgets, method="xgcm")
 
+def test_lambdas():
+    assert wmt.lambdas() == ["thetao", "so", "sigma0", "sigma1", "sigma2", "sigma3", "sigma4"]
+
 ## Default parameters except: wide bin range to cover all cases and group processes
 kwargs = {'bins': np.arange(-10, 100, 1.), 'group_processes': True}
 
@@ -79,3 +82,27 @@ def test_functional_3d_sigma4_default():
         total_wmt.sum().values,
         550052085.489147,
     )
+
+
+def test_salt_hlamdot_independent_of_datadict(helpers):
+    ds, idealized_budgets = helpers.idealized_dataset()
+    wmt_fresh = xwmt.WaterMassTransformations(helpers.idealized_grid(ds), idealized_budgets)
+    wmt_cached = xwmt.WaterMassTransformations(helpers.idealized_grid(ds), idealized_budgets)
+    wmt_cached.datadict("salt", "tendency")
+    for (expected, result) in zip(
+        wmt_fresh.calc_hlamdot_and_lambda("salt", "tendency"),
+        wmt_cached.calc_hlamdot_and_lambda("salt", "tendency")
+    ):
+        xr.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize("lambda_name", ["heat", "salt", "sigma0"])
+def test_integer_bins(helpers, lambda_name):
+    ds, idealized_budgets = helpers.idealized_dataset()
+    wmt_idealized = xwmt.WaterMassTransformations(helpers.idealized_grid(ds), idealized_budgets, method="xgcm")
+    int_bins = np.arange(0, 40, 2)
+    expected = wmt_idealized.map_transformations(lambda_name, bins=int_bins.astype(float))
+    result = wmt_idealized.map_transformations(lambda_name, bins=int_bins)
+    assert set(result.data_vars) == set(expected.data_vars)
+    for name in expected.data_vars:
+        np.testing.assert_allclose(result[name].values, expected[name].values)
@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+import xarray as xr
+import xgcm
+from xwmt.compute import _transform_conservative, transform_conservative
+
+def column_grid(Nx=200, Nz=30, seed=0):
+    rng = np.random.default_rng(seed)
+    ds = xr.Dataset(coords={
+        'x': xr.DataArray(np.arange(Nx, dtype=float), dims=("x",)),
+        'z_l': xr.DataArray(np.arange(Nz) + 0.5, dims=("z_l",)),
+        'z_i': xr.DataArray(np.arange(Nz + 1, dtype=float), dims=("z_i",)),
+    })
+    phi = rng.standard_normal((Nx, Nz))
+    lam = np.cumsum(rng.random((Nx, Nz + 1)), axis=-1)
+    # missing values
+    phi[::11, 4] = np.nan
+    lam[::7, 3] = np.nan
+    lam[::13, 10:12] = np.nan
+    # non-monotonic columns
+    lam[::3] = lam[::3, ::-1]
+    lam[1::5, 8:14] = lam[1::5, 8:14][:, ::-1]
+    # homogeneous cells and cell interfaces located exactly on bin edges
+    lam[::5, 5] = lam[::5, 6]
+    lam[1::4, 20] = 5.
+    lam[2::4, 16:18] = 4.
+    ds['phi'] = xr.DataArray(phi, dims=("x", "z_l"))
+    ds['lam_i'] = xr.DataArray(lam, dims=("x", "z_i"))
+    grid = xgcm.Grid(
+        ds,
+        coords={'Z': {'center': 'z_l', 'outer': 'z_i'}},
+        periodic=False,
+        autoparse_metadata=False
+    )
+    return grid
+
+def xgcm_transform(grid, bins):
+    return grid.transform(
+        grid._ds.phi, "Z", bins, target_data=grid._ds.lam_i, method="conservative"
+    ).transpose("x", "lam_i")
+
+bins = np.arange(0., 21., 1.)
+
+def test_transform_conservative_matches_xgcm():
+    grid = column_grid()
+    expected = xgcm_transform(grid, bins)
+    result = transform_conservative(grid, grid._ds.phi, bins, grid._ds.lam_i)
+    assert result.dims == expected.dims
+    np.testing.assert_allclose(result.lam_i.values, expected.lam_i.values)
+    np.testing.assert_allclose(result.values, expected.values, rtol=1e-12, atol=1e-12)
+
+def test_transform_conservative_decreasing_bins():
+    # Unlike xgcm (which reverses the leading axis), the bins are reversed along the bin dimension
+    grid = column_grid()
+    expected = xgcm_transform(grid, bins).isel({"lam_i": slice(None, None, -1)})
+    result = transform_conservative(grid, grid._ds.phi, bins[::-1], grid._ds.lam_i)
+    np.testing.assert_allclose(result.lam_i.values, expected.lam_i.values)
+    np.testing.assert_allclose(result.values, expected.values, rtol=1e-12, atol=1e-12)
+
+def test_transform_conservative_dask_z_chunks():
+    pytest.importorskip("dask")
+    grid = column_grid()
+    expected = transform_conservative(grid, grid._ds.phi, bins, grid._ds.lam_i)
+    result = transform_conservative(
+        grid,
+        grid._ds.phi.chunk({"x": 50, "z_l": 7}),
+        bins,
+        grid._ds.lam_i.chunk({"x": 50, "z_i": 9}),
+    )
+    assert result.chunks is not None
+    np.testing.assert_allclose(result.values, expected.values, rtol=1e-12, atol=1e-12)
+
+def test_transform_conservative_dask_mixed_precision():
+    pytest.importorskip("dask")
+    grid = column_grid()
+    result = transform_conservative(grid, grid._ds.phi.astype(np.float32).chunk({"x": 50}), bins, grid._ds.lam_i)
+    assert result.dtype == result.compute().dtype == np.float64
+
+@pytest.mark.parametrize("uniform_bins", [
+    np.arange(0., 21., 1.),
+    np.arange(20., 30., 0.1), # edges subject to round-off
+    np.linspace(-1., 30., 32),
+])
+def test_uniform_bins_match_bisection(uniform_bins):
+    # The direct computation of the overlapped bins for uniform bins must match bisection
+    grid = column_grid(Nx=500)
+    phi, lam_i = grid._ds.phi.values, grid._ds.lam_i.values
+    # also place interfaces exactly on (rounded) bin edges
+    lam_i[3::6, 2] = uniform_bins[5]
+    lam_i[4::6, 7:9] = uniform_bins[-3]
+    assert np.allclose(np.diff(uniform_bins), np.diff(uniform_bins)[0], rtol=1e-6, atol=0.)
+    bisection = _transform_conservative(phi, lam_i, uniform_bins, uniform=False)
+    direct = _transform_conservative(phi, lam_i, uniform_bins, uniform=True)
+    np.testing.assert_array_equal(direct, bisection)
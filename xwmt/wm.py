@@ -4,6 +4,8 @@ import xgcm
 import gsw
 import warnings
 
+from xwmt.compute import calc_density_terms
+
 class WaterMass:
     """
     A class object with multiple methods for characterizing and analyzing water masses in ocean models.
@@ -19,6 +21,7 @@ class WaterMass:
         rho_ref=1035.0,
         t_var="conservative",
         s_var="absolute",
+        z_contig=True,
         ):
         """
         Create a new watermass object from an input dataset.
@@ -43,10 +46,17 @@ class WaterMass:
             Supported temperature variable options are "conservative" and "potential"
         s_var: str
             Supported salinity variable options are "absolute" and "practical"
+        z_contig: bool
+            Default True. If True, rechunk dask-backed variables to a single chunk along the vertical
+            ("Z") dimensions, as required by the vertical transformations, so that this is done once
+            rather than on every transformation.
+            Note that this applies to all data variables with a vertical dimension, and that it can
+            make their chunks much larger (by up to the number of chunks along the vertical).
         """
-        # Grid copy
+        # Grid copy. A shallow copy of the dataset is sufficient, since variables are
+        # only ever added to (or replaced in) it, never modified in place.
         self.grid = xgcm.Grid(
-            grid._ds.copy(),
+            grid._ds.copy(deep=False),
             coords={
                 **{ax:grid.axes[ax].coords for ax in grid.axes.keys()},
             },
@@ -64,7 +74,14 @@ class WaterMass:
         self.teos10 = teos10
         self.cp = cp
         self.rho_ref = rho_ref
-        
+
+        if z_contig and "Z" in self.grid.axes:
+            z_dims = self.grid.axes['Z'].coords.values()
+            for name, da in self.grid._ds.data_vars.items():
+                z_chunks = {d: -1 for d in z_dims if d in da.dims}
+                if da.chunks is not None and len(z_chunks):
+                    self.grid._ds[name] = da.chunk(z_chunks)
+
         if "Z_metrics" in vars(self.grid):
             pass
         elif self.h_name in self.grid._ds:
@@ -117,6 +134,10 @@ class WaterMass:
             })
             self.h_name = "h"
         self.grid._ds['z'] = -self.grid.cumsum(self.grid.Z_metrics["outer"], "Z")
+        # Outcrop masks, shared by all surface arrays expanded in the vertical
+        self._outcrop_masks = {}
+        # Names of the density variables derived by `get_density` (rather than provided)
+        self._derived_density_vars = set()
         
     def get_density(self, density_name=None, add_to_dataset=True):
         """
@@ -145,10 +166,11 @@ class WaterMass:
         
         if (
             "alpha" not in self.grid._ds or "beta" not in self.grid._ds or self.teos10
-        ) and "p" not in vars(self):
+        ) and "p" not in self.grid._ds:
             self.grid._ds['p'] = xr.apply_ufunc(
                 gsw.p_from_z, self.grid._ds.z, self.grid._ds.lat, 0, 0, dask="parallelized"
             )
+            self._derived_density_vars.add("p")
 
         if "sigma" in density_name:
             z_ref = density_name.replace("sigma", "")
@@ -167,64 +189,67 @@ class WaterMass:
         
         # Prognostic temperature and salinity in MOM6 should be interpreted
         # as conservative temperature and absolute salinity (following McDougall
-        # et al. 2021).
-        if self.teos10 and "sa" not in self.grid._ds:
-            if self.s_var == "absolute":
+        # et al. 2021). Variables that need no conversion are used as they are.
+        if self.teos10:
+            if "sa" not in self.grid._ds and self.s_var == "absolute":
                 self.grid._ds['sa'] = self.grid._ds[self.s_name]
-            elif self.s_var == "practical":
-                self.grid._ds['sa'] = xr.apply_ufunc(
-                    gsw.SA_from_SP,
-                    self.grid._ds[self.s_name],
-                    self.grid._ds.p,
-                    self.grid._ds.lon,
-                    self.grid._ds.lat,
-                    dask="parallelized",
-                )
-        if self.teos10 and "ct" not in self.grid._ds:
-            if self.t_var == "conservative":
+                self._derived_density_vars.add("sa")
+            if "ct" not in self.grid._ds and self.t_var == "conservative":
                 self.grid._ds['ct'] = self.grid._ds[self.t_name]
-            elif self.t_var == "potential":
-                self.grid._ds['ct'] = xr.apply_ufunc(
-                    gsw.CT_from_t,
-                    self.grid._ds.sa,
-                    self.grid._ds[self.t_name],
-                    self.grid._ds.p,
-                    dask="parallelized"
-                )
-        if not self.teos10 and ("sa" not in vars(self) or "ct" not in vars(self)):
-            self.grid._ds['sa'] = self.grid._ds[self.s_name]
-            self.grid._ds['ct'] = self.grid._ds[self.t_name]
+                self._derived_density_vars.add("ct")
+            s_var = "absolute" if "sa" in self.grid._ds else self.s_var
+            t_var = "conservative" if "ct" in self.grid._ds else self.t_var
+            s = self.grid._ds["sa"] if "sa" in self.grid._ds else self.grid._ds[self.s_name]
+            t = self.grid._ds["ct"] if "ct" in self.grid._ds else self.grid._ds[self.t_name]
+        else:
+            s_var, t_var = "absolute", "conservative"
+            s, t = self.grid._ds[self.s_name], self.grid._ds[self.t_name]
+            self.grid._ds['sa'] = s
+            self.grid._ds['ct'] = t
+            self._derived_density_vars.update(["sa", "ct"])
 
-        # Calculate thermal expansion coefficient alpha (1/K) at reference pressure
-        if "alpha" not in self.grid._ds:
-            self.grid._ds['alpha'] = xr.apply_ufunc(
-                gsw.alpha, self.grid._ds.sa, self.grid._ds.ct, p_ref, dask="parallelized"
-            )
+        sigma_name = density_name if (density_name is not None and "sigma" in density_name) else None
+        if sigma_name in self.grid._ds:
+            sigma_name = None
 
-        # Calculate the haline contraction coefficient beta (kg/g) at reference pressure
-        if "beta" not in self.grid._ds:
-            self.grid._ds['beta'] = xr.apply_ufunc(
-                gsw.beta, self.grid._ds.sa, self.grid._ds.ct, p_ref, dask="parallelized"
+        # Absolute salinity, conservative temperature, thermal expansion coefficient alpha (1/K)
+        # and haline contraction coefficient beta (kg/g) at reference pressure, and potential
+        # density (kg/m^3), all derived in a single fused pass
+        terms = ["sa", "ct", "alpha", "beta"]
+        if any([term not in self.grid._ds for term in terms]):
+            if sigma_name is not None:
+                terms.append(sigma_name)
+            # Only pass data arrays positionally: dask would turn None into an object array
+            args = [s, t, self.grid._ds.p, p_ref]
+            if s_var == "practical":
+                args += [self.grid._ds.lon, self.grid._ds.lat]
+            derived = xr.apply_ufunc(
+                calc_density_terms,
+                *args,
+                kwargs={"s_var": s_var, "t_var": t_var, "density_name": sigma_name},
+                output_core_dims=[[] for term in terms],
+                output_dtypes=[float for term in terms],
+                dask="parallelized"
             )
+            for term, da in zip(terms, derived):
+                if term not in self.grid._ds:
+                    self.grid._ds[term] = da.rename(term)
+                    self._derived_density_vars.add(term)
+
+        # Otherwise, only the potential density remains to be derived
+        elif sigma_name is not None:
+            self.grid._ds[sigma_name] = xr.apply_ufunc(
+                getattr(gsw, sigma_name),
+                self.grid._ds.sa,
+                self.grid._ds.ct,
+                dask="parallelized"
+            ).rename(sigma_name)
+            self._derived_density_vars.add(sigma_name)
 
-        # Calculate potential density (kg/m^3)
-        if density_name is None:
+        if density_name is None or density_name not in self.grid._ds:
             return None
-        
-        else:
-            if density_name not in self.grid._ds:
-                if ("sigma" in density_name):
-                    self.grid._ds[density_name] = xr.apply_ufunc(
-                        getattr(gsw, density_name),
-                        self.grid._ds.sa,
-                        self.grid._ds.ct,
-                        dask="parallelized"
-                    ).rename(density_name)
-                    
-                else:
-                    return None
 
-            return self.grid._ds[density_name]
+        return self.grid._ds[density_name]
 
     def get_outcrop_lev(self, position="center", incrop=False):
         """
@@ -291,12 +316,29 @@ class WaterMass:
         z_coord = self.grid.axes['Z'].coords[target_position]
         return (
             da_surf.expand_dims({z_coord: self.grid._ds[z_coord]})
-            .where(
+            .where(self.outcrop_mask(position=target_position), 0.)
+        )
+
+    def outcrop_mask(self, position="outer"):
+        """
+        Boolean mask that is True only in the vertical coordinate level that outcrops at the
+        sea surface (see `get_outcrop_lev`). The mask depends only on the layer thicknesses,
+        so it is built once per `position` and reused by every surface array that is expanded
+        in the vertical.
+
+        Parameters
+        ----------
+        position: str
+            Position of the desired vertical coordinate in the `self.grid` instance of `xgcm.Grid`.
+            Default: "outer". Other supported option is "center".
+        """
+        if position not in self._outcrop_masks:
+            z_coord = self.grid.axes['Z'].coords[position]
+            self._outcrop_masks[position] = (
                 self.grid._ds[z_coord] ==
-                self.get_outcrop_lev(position=target_position),
-                0.
+                self.get_outcrop_lev(position=position)
             )
-        )
+        return self._outcrop_masks[position]
 
     def infer_bins(self, da, percentiles=[0., 1.], nbins=100, surface=False):
         """
@@ -316,10 +358,12 @@ class WaterMass:
         """
         if surface:
             da=self.sel_outcrop_lev(da)
+        # Evaluate the bounds eagerly (in a single pass) so that the bins are a
+        # concrete array rather than a reduction embedded in every downstream graph
         if percentiles != [0., 1.]:
-            vmin, vmax = da.quantile(percentiles, dim=da.dims)
+            vmin, vmax = da.quantile(percentiles, dim=da.dims).values
         else:
-            vmin, vmax = da.min(), da.max()
+            vmin, vmax = xr.concat([da.min(), da.max()], dim="bounds").values
         return np.linspace(vmin, vmax, nbins)
 
     def zonal_mean(self, da, oceanmask_name="wet"):
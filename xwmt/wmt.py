@@ -1,11 +1,13 @@
 import copy
+import itertools
 import numpy as np
+import pandas as pd
 import xarray as xr
 from xhistogram.xarray import histogram
 import warnings
 
 from xwmt.wm import WaterMass
-from xwmt.compute import calc_hlamdot_tendency
+from xwmt.compute import calc_hlamdot_tendency, rechunk_contiguous, transform_conservative
 
 class WaterMassTransformations(WaterMass):
     """
@@ -20,7 +22,9 @@ class WaterMassTransformations(WaterMass):
         cp=3992.0,
         rho_ref=1035.0,
         method="default",
-        rebin=False
+        rebin=False,
+        z_contig=True,
+        persist=False
         ):
         """
         Create a new watermass object from an input dataset.
@@ -38,10 +42,24 @@ class WaterMassTransformations(WaterMass):
             Value of specific heat capacity.
         rho_ref: float
             Value of reference potential density. Note: WaterMass is assumed to be Boussinesq.
+        z_contig: bool
+            Default True. If True, rechunk dask-backed variables to a single chunk along the vertical
+            ("Z") dimensions once, rather than on every transformation.
+            Note that this applies to all data variables with a vertical dimension, and that it can
+            make their chunks much larger (by up to the number of chunks along the vertical).
+        persist: bool
+            Default False. If True, the dask-backed density variables derived for a density lambda
+            (see `persist_density`) are computed eagerly, once, when it is first transformed, rather
+            than as part of the (otherwise lazy) transformations.
         """
         
         self.method = method
         self.rebin = rebin
+        self.persist = persist
+        # Unit conversions of the tendencies of each component (salt: kg to g), as applied by
+        # `datadict`. Since the transformations are linear, these are applied after binning rather
+        # than to the full tendency arrays in the transformations (see `_raw_datadict`).
+        self.tendency_scales = {"heat": 1., "salt": 1000.}
         self.component_dict = {}
         for component in ["heat", "salt"]:
             if component in budgets_dict:
@@ -64,13 +82,19 @@ class WaterMassTransformations(WaterMass):
             h_name=h_name,
             teos10=teos10,
             cp=cp,
-            rho_ref=rho_ref
+            rho_ref=rho_ref,
+            z_contig=z_contig
         )
         
         self.lambdas_dict = {
             **self.component_dict,
             "density": ["sigma0", "sigma1", "sigma2", "sigma3", "sigma4"],
         }
+        self._all_lambdas = tuple(itertools.chain.from_iterable(
+            [v] if isinstance(v, str) else v
+            for v in self.lambdas_dict.values()
+            if v is not None
+        ))
         
         self.budgets_dict = copy.deepcopy(budgets_dict)
         for (term, bdict) in self.budgets_dict.items():
@@ -79,6 +103,42 @@ class WaterMassTransformations(WaterMass):
                 if ptype in ["lhs", "rhs"]:
                     getattr(self, f"processes_{term}_dict").update(_processes)
 
+        self.reset_caches()
+
+    def reset_caches(self):
+        """
+        (Re)build the cached lookups derived from the dataset. Tendency variables are assumed not
+        to change after construction, so these are only evaluated once; call this method after
+        adding, removing, or replacing variables in `self.grid._ds`. This also drops the density
+        variables previously derived by `get_density` (e.g. "sa", "ct", "alpha", "beta", "sigma0"),
+        so that they are derived again from the current temperature and salinity. The vertical
+        grid metrics derived from the thickness at construction are not updated.
+        """
+        for name in self._derived_density_vars:
+            if name in self.grid._ds:
+                del self.grid._ds[name]
+        self._derived_density_vars.clear()
+        # Snapshot of the names of the variables (including the tendency variables) in the dataset
+        self._ds_varnames = frozenset(self.grid._ds.variables)
+        self._processes = self._find_processes(available=False)
+        self._available_processes = self._find_processes(available=True)
+        self._datadicts = {}
+        self._raw_datadicts = {}
+        self._hlamdot_tendencies = {}
+        self._lam_i_cache = {}
+        self._density_cache = {}
+        self._outcrop_masks = {}
+        # Names of the heat and salt components of each process, as summed by `_sum_components`,
+        # only including components for which the process has an underlying tendency
+        self._component_terms = []
+        for proc in self._available_processes:
+            names = [
+                f"{proc}_{component}" for component in ["heat", "salt"]
+                if getattr(self, f"processes_{component}_dict").get(proc, None) is not None
+            ]
+            if len(names):
+                self._component_terms.append((proc, names))
+
     def lambdas(self, lambda_key=None):
         """
         Return dictionary of desired lambdas, defaulting to all (temperature, salinity, and all densities).
@@ -93,7 +153,7 @@ class WaterMassTransformations(WaterMass):
         list
         """
         if lambda_key is None:
-            return sum(self.lambdas_dict.values(), [])
+            return list(self._all_lambdas)
         else:
             return self.lambdas_dict.get(lambda_key, None)
         
@@ -143,7 +203,7 @@ class WaterMassTransformations(WaterMass):
     def available_processes(self, available=True):
         """
         Get a list of all tendency processes that are both specified by `budgets_dict` and available in
-        the dataset.
+        the dataset. These are determined once, when the object is created (see `reset_caches`).
 
         Parameters
         ----------
@@ -155,23 +215,29 @@ class WaterMassTransformations(WaterMass):
         names : tuple
             `(component_name, process)`
         """
+        if available:
+            return list(self._available_processes)
+        else:
+            return set(self._processes)
+
+    def _find_processes(self, available=True):
         processes = (
             self.processes_heat_dict.keys() |
             self.processes_salt_dict.keys() |
             self.processes_mass_dict.keys()
         )
         if available:
-            _processes = []
-            for process in processes:
-                p1 = self.processes_heat_dict.get(process, None)
-                p2 = self.processes_salt_dict.get(process, None)
-                p3 = self.processes_mass_dict.get(process, None)
-                if (((p1 is None) or (p1 is not None and p1 in self.grid._ds)) and
-                    ((p2 is None) or (p2 is not None and p2 in self.grid._ds)) and
-                    ((p3 is None) or (p3 is not None and p3 in self.grid._ds))
-                ):
-                    _processes.append(process)
-            return _processes
+            # Names of the variables required by each process, checked against the
+            # snapshot of the dataset's variable names
+            required = {
+                process: {
+                    self.processes_heat_dict.get(process, None),
+                    self.processes_salt_dict.get(process, None),
+                    self.processes_mass_dict.get(process, None),
+                } - {None}
+                for process in processes
+            }
+            return [process for process in processes if required[process] <= self._ds_varnames]
         else:
             return processes
 
@@ -190,18 +256,34 @@ class WaterMassTransformations(WaterMass):
         -------
         ddict : dict
         """
-        
+        # The tendency variables do not change after construction, so each dictionary
+        # (and the vertically-expanded arrays in it) is only built once
+        if (component, term) not in self._datadicts:
+            self._datadicts[(component, term)] = self._build_datadict(component, term)
+        return self._datadicts[(component, term)]
+
+    def _raw_datadict(self, component, term):
+        """
+        As `datadict`, but with the tendencies in the units of the underlying variables in
+        `self.grid._ds`, i.e. without the unit conversion `self.tendency_scales[component]`,
+        which is instead applied after the transformations.
+        """
+        if (component, term) not in self._raw_datadicts:
+            self._raw_datadicts[(component, term)] = self._build_datadict(component, term, scaled=False)
+        return self._raw_datadicts[(component, term)]
+
+    def _build_datadict(self, component, term, scaled=True):
         (component_name, process) = self.process_names(component, term)
         
-        if process is None or process not in self.grid._ds:
+        if process is None or process not in self._ds_varnames:
             return
 
         tend_arr = self.grid._ds[process]
         
         # Multiply salt tendency by 1000 to convert to g/m^2/s
-        if component=="salt":
-            tend_arr = tend_arr*1000.
-            
+        if scaled and (self.tendency_scales[component] != 1.):
+            tend_arr = tend_arr*self.tendency_scales[component]
+
         scalar = self.grid._ds[component_name]
         if self.grid.axes['Z'].coords["center"] not in scalar.dims:
             scalar = self.expand_surface_array_vertically(scalar, target_position="center")
@@ -222,6 +304,51 @@ class WaterMassTransformations(WaterMass):
         
         return {"scalar": scalar, **tend_dict}
 
+    def hlamdot_tendency(self, component, term, scaled=True):
+        """
+        Get the layer-integrated extensive tendency of 'term' for 'component', evaluated
+        once and reused across lambdas.
+
+        Parameters
+        ----------
+        component: str
+            Either "heat" or "salt".
+        term: str
+            Name of tendency term
+        scaled: bool
+            Default True. If False, the unit conversion `self.tendency_scales[component]`
+            (e.g. from kg to g of salt) is not applied, i.e. the tendency is in the units
+            of the underlying variables in `self.grid._ds`.
+
+        Returns
+        -------
+        hlamdot : xr.DataArray or None
+        """
+        if (component, term) not in self._hlamdot_tendencies:
+            datadict = self._raw_datadict(component, term)
+            self._hlamdot_tendencies[(component, term)] = (
+                calc_hlamdot_tendency(self.grid, datadict)
+                if datadict is not None else None
+            )
+        hlamdot = self._hlamdot_tendencies[(component, term)]
+        scale = self.tendency_scales[component]
+        if scaled and (hlamdot is not None) and (scale != 1.):
+            return hlamdot*scale
+        return hlamdot
+
+    def get_density(self, density_name=None, add_to_dataset=True):
+        """
+        Derive density variables (see `WaterMass.get_density`), memoized per `density_name`
+        so that the TEOS10 derivation is only set up once and reused by all process terms
+        (see `reset_caches`).
+        """
+        if density_name not in self._density_cache:
+            self._density_cache[density_name] = super().get_density(
+                density_name,
+                add_to_dataset=add_to_dataset
+            )
+        return self._density_cache[density_name]
+
     def rho_tend(self, term):
         """
         Get density tendency 'term' from underlying heat and salt tendencies. 
@@ -240,15 +367,13 @@ class WaterMassTransformations(WaterMass):
         # Either heat or salt tendency/flux may not be used
         rho_tend_heat, rho_tend_salt = None, None
 
-        datadict = self.datadict("heat", term)
-        if datadict is not None:
-            heat_tend = calc_hlamdot_tendency(self.grid, datadict)
+        heat_tend = self.hlamdot_tendency("heat", term)
+        if heat_tend is not None:
             # Density tendency due to heat flux (kg/s/m^2)
             rho_tend_heat = -(self.grid._ds.alpha / self.cp) * heat_tend
 
-        datadict = self.datadict("salt", term)
-        if datadict is not None:
-            salt_tend = calc_hlamdot_tendency(self.grid, datadict)
+        salt_tend = self.hlamdot_tendency("salt", term)
+        if salt_tend is not None:
             # Density tendency due to salt/salinity (kg/s/m^2)
             rho_tend_salt = self.grid._ds.beta * salt_tend
 
@@ -269,6 +394,22 @@ class WaterMassTransformations(WaterMass):
         ----------
         hlamdot, lam : xr.DataArray, xr.DataArray
         """
+        hlamdot, lam, scale = self._calc_hlamdot_and_lambda(lambda_name, term)
+        if type(hlamdot) is dict:
+            hlamdot = {
+                tend: (v*scale[tend] if v is not None else None)
+                for tend, v in hlamdot.items()
+            }
+        elif hlamdot is not None:
+            hlamdot = hlamdot*scale
+        return hlamdot, lam
+
+    def _calc_hlamdot_and_lambda(self, lambda_name, term):
+        """
+        As `calc_hlamdot_and_lambda`, but with the constant factors of the extensive tendencies
+        (unit conversions, `cp`, and `rho_ref`) returned separately as `scale` (a dictionary for
+        density lambdas), so that they can be applied to the much smaller transformed tendencies.
+        """
         
         lam_var = self.get_lambda_var(lambda_name)
         prebinned = all([
@@ -279,17 +420,19 @@ class WaterMassTransformations(WaterMass):
         # Get layer-integrated potential temperature tendency
         # from tendency of heat (in W/m^2), lambda = temperature
         if lambda_name == "heat":
-            datadict = self.datadict("heat", term)
+            datadict = self._raw_datadict("heat", term)
             if datadict is not None:
-                hlamdot = calc_hlamdot_tendency(self.grid, datadict) / self.cp
+                hlamdot = self.hlamdot_tendency("heat", term, scaled=False)
+                scale = self.tendency_scales["heat"] / self.cp
                 lam = datadict["scalar"] if not prebinned else self.grid._ds[f"{lam_var}_l"]
 
         # Get layer-integrated practical salinity tendency
         # from tendency of salt (in g/s/m^2), lambda = salinity
         elif lambda_name == "salt":
-            datadict = self.datadict("salt", term)
+            datadict = self._raw_datadict("salt", term)
             if datadict is not None:
-                hlamdot = calc_hlamdot_tendency(self.grid, datadict)
+                hlamdot = self.hlamdot_tendency("salt", term, scaled=False)
+                scale = self.tendency_scales["salt"]
                 lam = datadict["scalar"] if not prebinned else self.grid._ds[f"{lam_var}_l"]
 
         # Get layer-integrated potential density tendencies (in kg/s/m^2)
@@ -298,13 +441,17 @@ class WaterMassTransformations(WaterMass):
         # (1) transformation due to heat tend, (2) transformation due to salt tend
         elif lambda_name in self.lambdas("density"):
             lam = self.get_density(lambda_name)
-            rhos = self.rho_tend(term)
-            hlamdot = {}
-            for idx, tend in enumerate(self.component_dict.keys()):
-                if rhos[idx] is not None:
-                    hlamdot[tend] = rhos[idx]*self.rho_ref
-                elif rhos[idx] is None:
-                    hlamdot[tend] = rhos[idx]
+            # Density tendency due to heat flux and due to salt/salinity (as in `rho_tend`)
+            coefficients = {
+                "heat": (self.grid._ds.alpha, -self.tendency_scales["heat"] / self.cp),
+                "salt": (self.grid._ds.beta, self.tendency_scales["salt"]),
+            }
+            hlamdot, scale = {}, {}
+            for tend in self.component_dict.keys():
+                tend_arr = self.hlamdot_tendency(tend, term, scaled=False)
+                coefficient, factor = coefficients[tend]
+                scale[tend] = factor*self.rho_ref
+                hlamdot[tend] = coefficient*tend_arr if tend_arr is not None else None
                     
             if prebinned and not(self.rebin):
                 lam = self.grid._ds[f"{lam_var}_l"]
@@ -315,20 +462,141 @@ class WaterMassTransformations(WaterMass):
             raise ValueError(f"{lambda_name} is not a supported lambda.")
         
         try:
-            return hlamdot, lam
+            return hlamdot, lam, scale
         
         except NameError:
-            return None, None
+            return None, None, None
 
-    def transform_hlamdot_term(self, lambda_name, term, bins=None, mask=None, integrate=False):
+    def persist_density(self, density_name):
         """
-        Lazily compute extensive tendencies and transform them into lambda space
-        along the vertical ("Z") dimension.
+        Derive `density_name` (and the associated alpha and beta coefficients) and, if they are
+        dask-backed, persist them in `self.grid._ds` so that they are evaluated only once and reused
+        by all subsequent tendency terms. This computes them eagerly. Variables that were provided
+        in the dataset, rather than derived by `get_density`, are left as they are.
+
+        Parameters
+        ----------
+        density_name : str
+            Name of density variable (see `WaterMass.get_density`).
+        """
+        self.get_density(density_name)
+        names = [
+            name for name in ["alpha", "beta", density_name]
+            if name in self._derived_density_vars and self.grid._ds[name].chunks is not None
+        ]
+        if len(names):
+            # Persist together, since they are outputs of the same (fused) computation
+            persisted = self.grid._ds[names].persist()
+            for name in names:
+                self.grid._ds[name] = persisted[name]
+        if density_name in self.grid._ds:
+            self._density_cache[density_name] = self.grid._ds[density_name]
+
+    def calc_hlamdot_terms(self, lambda_name, term, mask=None):
         """
+        Get the (optionally masked) layer-integrated extensive tendencies for 'term', keyed
+        by the name of the corresponding output variable, the constant factors that remain to
+        be applied to them (see `_calc_hlamdot_and_lambda`), and the scalar field of lambda.
 
-        hlamdot, lam = self.calc_hlamdot_and_lambda(lambda_name, term)
+        Parameters
+        ----------
+        lambda_name : str
+            Specifies lambda
+        term : str
+            Specifies process term
+        mask : xr.DataArray, optional
+            Boolean mask; tendencies are set to zero where it is False.
+
+        Returns
+        ----------
+        hlamdots, scales, lam : dict, dict, xr.DataArray
+        """
+        hlamdot, lam, scale = self._calc_hlamdot_and_lambda(lambda_name, term)
         if hlamdot is None:
-            return
+            return None, None, None
+
+        if type(hlamdot) is dict:
+            hlamdots = {
+                f"{term}_{tend}": v
+                for tend, v in hlamdot.items()
+                if v is not None
+            }
+            scales = {f"{term}_{tend}": scale[tend] for tend in hlamdot}
+        else:
+            hlamdots = {f"{term}": hlamdot}
+            scales = {f"{term}": scale}
+
+        if mask is not None:
+            hlamdots = {k: v.where(mask, 0.) for k, v in hlamdots.items()}
+
+        return hlamdots, scales, lam
+
+    def interfacial_lambda(self, lambda_name, lam):
+        """
+        Get lambda on the vertical ("Z") cell interfaces, as needed for conservative transformations.
+        The result is the same for every process term, so it is cached per `lambda_name` (see
+        `reset_caches`).
+
+        Parameters
+        ----------
+        lambda_name : str
+            Specifies lambda
+        lam : xr.DataArray
+            Scalar field of lambda.
+
+        Returns
+        ----------
+        lam_i : xr.DataArray
+        """
+        if lambda_name in self._lam_i_cache:
+            return self._lam_i_cache[lambda_name]
+
+        # If lambda is already a vertical coordinate, its interfaces are already known
+        lam_var = self.get_lambda_var(lambda_name)
+        prebinned = all([(c in self.grid.axes['Z'].coords.values()) for c in [f"{lam_var}_l", f"{lam_var}_i"]])
+        if prebinned and not(self.rebin):
+            lam_i = self.grid._ds[f"{lam_var}_i"]
+        else:
+            lam_i = (
+                self.grid.interp(lam, "Z", boundary="extend")
+                .rename(f"{lam.name}_i")
+            )
+        # Coalesce the vertical chunks once here, rather than on every transformation
+        lam_i = rechunk_contiguous(lam_i, self.grid.axes['Z'].coords['outer'])
+        self._lam_i_cache[lambda_name] = lam_i
+        return lam_i
+
+    def transform_hlamdots(self, lambda_name, hlamdots, lam, bins=None, integrate=False, scales=None):
+        """
+        Lazily transform extensive tendencies that share the same scalar field of lambda
+        into lambda space along the vertical ("Z") dimension.
+
+        The tendencies are stacked along a temporary "term" dimension so that all of them
+        are binned in a single pass over `lam`.
+
+        Parameters
+        ----------
+        lambda_name : str
+            Specifies lambda
+        hlamdots : dict
+            Layer-integrated extensive tendencies, keyed by output variable name.
+        lam : xr.DataArray
+            Scalar field of lambda.
+        bins : array like, optional
+            Edges of the lambda bins. If not specified, inferred from `lam`.
+        integrate : bool
+            Default False. If True, also integrate along the horizontal dimensions ("X", "Y").
+        scales : dict, optional
+            Constant factors by which to multiply the transformed tendencies, keyed by output
+            variable name (default: 1). Since the transformations are linear, this is equivalent
+            to (but much cheaper than) scaling the tendencies themselves.
+
+        Returns
+        ----------
+        hlamdot_transformed : xr.Dataset
+        """
+        if not len(hlamdots):
+            return xr.Dataset()
 
         if self.method in ["default", "xhistogram"]:
             if integrate:
@@ -340,112 +608,95 @@ class WaterMassTransformations(WaterMass):
             else:
                 dim = [self.grid.axes['Z'].coords['center']]
 
-        if mask is not None:
-            if type(hlamdot) is dict:
-                hlamdot = {
-                    k:v.where(mask, 0.)
-                    if v is not None else None
-                    for k,v in hlamdot.items()
-                }
-            else:
-                hlamdot = hlamdot.where(mask, 0.)
-
         if bins is None:
             bins = self.infer_bins(lam)
-            
+
         # If lambda is already a vertical coordinate, no need to use the 3D lambda for transformations
         lam_var = self.get_lambda_var(lambda_name)
         prebinned = all([(c in self.grid.axes['Z'].coords.values()) for c in [f"{lam_var}_l", f"{lam_var}_i"]])
         if prebinned and not(self.rebin):
             onedimensional_target = True
             lam = lam.rename({lam.name: lam_var}).rename(lam_var)
-            lam_i = self.grid._ds[f"{lam_var}_i"]
             self.method = "xgcm"
         else:
             onedimensional_target = False
-            lam_i = (
-                self.grid.interp(lam, "Z", boundary="extend")
-                .rename(f"{lam.name}_i")
+
+        hlamdot = xr.concat(
+            [v.fillna(0.) for v in hlamdots.values()],
+            dim=pd.Index(list(hlamdots.keys()), name="term"),
+            coords="minimal",
+            compat="override"
+        )
+        bin_bounds = bins.values if isinstance(bins, xr.DataArray) else bins
+        target_dim = f"{lam.name}_l_target"
+        # Bin widths, aligned with the transformed tendencies by dimension name, combined with
+        # the constant factor of each term into a single (small) divisor
+        dbin = xr.DataArray(np.diff(np.asarray(bin_bounds, dtype=float)), dims=(target_dim,))
+        if scales is not None:
+            dbin = dbin / xr.DataArray(
+                np.array([scales.get(name, 1.) for name in hlamdots], dtype=dbin.dtype),
+                dims=("term",)
             )
+        # xhistogram cases
+        if (((self.method == "default") and integrate) or
+            (self.method == "xhistogram")):
+            hlamdot_transformed = histogram(
+                lam,
+                bins=[bin_bounds],
+                dim=dim,
+                weights=hlamdot,
+                bin_dim_suffix="",
+                # TEMPORARY FIX FOR https://github.com/xgcm/xhistogram/issues/16
+                block_size=None
+            ).rename({lam.name: target_dim})
+        # xgcm cases
+        elif (((self.method == "default") and not integrate) or
+              (self.method == "xgcm")):
+            # lambda on cell interfaces is only needed by (and computed for) the xgcm cases
+            lam_i = self.interfacial_lambda(lambda_name, lam)
+            hlamdot_transformed = transform_conservative(
+                self.grid,
+                hlamdot,
+                target=bin_bounds,
+                target_data=lam_i,
+            ).rename({lam_i.name: target_dim})
+            if integrate:
+                hlamdot_transformed = hlamdot_transformed.sum(
+                    [self.grid.axes['X'].coords['center'],
+                     self.grid.axes['Y'].coords['center']]
+                )
+        return (
+            (hlamdot_transformed / dbin)
+            .assign_coords({"term": hlamdot.term})
+            .to_dataset(dim="term")
+        )
 
+    def transform_hlamdot_term(self, lambda_name, term, bins=None, mask=None, integrate=False):
+        """
+        Lazily compute extensive tendencies and transform them into lambda space
+        along the vertical ("Z") dimension.
+        """
+
+        hlamdots, scales, lam = self.calc_hlamdot_terms(lambda_name, term, mask=mask)
+        if hlamdots is None:
+            return
+
+        hlamdot_transformed = self.transform_hlamdots(
+            lambda_name, hlamdots, lam, bins=bins, integrate=integrate, scales=scales
+        )
         if lambda_name in self.lambdas("density"):
-            hlamdot_transformed = []
-            for tend in self.component_dict.keys():
-                (component_name, process) = self.process_names(tend, term)
-                if hlamdot[tend] is not None:
-                    bin_bounds = bins.values if isinstance(bins, xr.DataArray) else bins
-                    # xhistogram cases
-                    if (((self.method == "default") and integrate) or
-                        (self.method == "xhistogram")):
-                        hlamdot_transformed_component = histogram(
-                            lam,
-                            bins=[bin_bounds],
-                            dim=dim,
-                            weights=hlamdot[tend].fillna(0.),
-                            bin_dim_suffix="",
-                            # TEMPORARY FIX FOR https://github.com/xgcm/xhistogram/issues/16
-                            block_size=None
-                        ).rename({lam.name:f"{lam.name}_l_target"})
-                    # xgcm cases
-                    elif (((self.method == "default") and not integrate) or
-                          (self.method == "xgcm")):
-                        hlamdot_transformed_component = self.grid.transform(
-                            hlamdot[tend].fillna(0.),
-                            "Z",
-                            target=bin_bounds,
-                            target_data=lam_i,
-                            method="conservative",
-                        ).rename({lam_i.name: f"{lam.name}_l_target"})
-                        if integrate:
-                            hlamdot_transformed_component = hlamdot_transformed_component.sum(
-                                [self.grid.axes['X'].coords['center'],
-                                 self.grid.axes['Y'].coords['center']]
-                            )
-                    hlamdot_transformed.append(
-                        (hlamdot_transformed_component / np.diff(bin_bounds)).rename(f"{term}_{tend}")
-                    )
-
-            hlamdot_transformed = xr.merge(hlamdot_transformed)
+            return hlamdot_transformed
         else:
-            (component_name, process) = self.process_names(
-                "salt" if lambda_name == "salinity" else "heat", term
-            )
-            bin_bounds = bins.values if isinstance(bins, xr.DataArray) else bins
-            if (((self.method == "default") and integrate) or
-                (self.method == "xhistogram")):
-                hlamdot_transformed = histogram(
-                    lam,
-                    bins=[bin_bounds],
-                    dim=dim,
-                    weights=hlamdot.fillna(0.),
-                    bin_dim_suffix="",
-                    # TEMPORARY FIX FOR https://github.com/xgcm/xhistogram/issues/16
-                    block_size=None
-                ).rename({lam.name:f"{lam.name}_l_target"})
-            elif (((self.method == "default") and not integrate) or
-                  (self.method == "xgcm")):
-                hlamdot_transformed = self.grid.transform(
-                    hlamdot.fillna(0.),
-                    "Z",
-                    target=bin_bounds,
-                    target_data=lam_i,
-                    method="conservative"
-                ).rename({lam_i.name: f"{lam.name}_l_target"})
-                if integrate:
-                    hlamdot_transformed = hlamdot_transformed.sum(
-                        [self.grid.axes['X'].coords['center'],
-                         self.grid.axes['Y'].coords['center']]
-                    )
-            hlamdot_transformed = (
-                hlamdot_transformed / np.diff(bin_bounds)
-            ).rename(f"{term}")
-        return hlamdot_transformed
+            return hlamdot_transformed[f"{term}"]
 
     def transform_hlamdot(self, lambda_name, term=None, bins=None, mask=None, integrate=True):
         """
         Lazily compute extensive tendencies, transform them into lambda space
         along the vertical ("Z") dimension, and integrate along the
         horizontal dimensions ("X", "Y").
+
+        All terms are transformed together in a single pass. If `self.persist`, the derived
+        density variables of a density lambda are first computed eagerly (see `persist_density`).
         """
         
         if isinstance(term, str):
@@ -456,15 +707,24 @@ class WaterMassTransformations(WaterMass):
             terms = self.available_processes()
         else:
             return
-            
-        wmts = []
+
+        if self.persist and (lambda_name in self.lambdas("density")):
+            self.persist_density(lambda_name)
+
+        hlamdots, scales, lam = {}, {}, None
         for term in terms:
-            wmt = self.transform_hlamdot_term(lambda_name, term=term, bins=bins, mask=mask, integrate=integrate)
-            if wmt is not None:
-                wmts.append(wmt)
+            hlamdots_term, scales_term, lam_term = self.calc_hlamdot_terms(lambda_name, term, mask=mask)
+            if hlamdots_term is not None:
+                hlamdots.update(hlamdots_term)
+                scales.update(scales_term)
+                lam = lam_term
             else:
                 print(f"Process '{term}' for component {lambda_name} is unavailable.")
-        return xr.merge(wmts)
+        if lam is None:
+            return xr.Dataset()
+        return self.transform_hlamdots(
+            lambda_name, hlamdots, lam, bins=bins, integrate=integrate, scales=scales
+        )
 
     ### Helper function to groups terms based on density components (sum_components)
     ### and physical processes (group_processes)
@@ -474,17 +734,28 @@ class WaterMassTransformations(WaterMass):
         if isinstance(ds_terms, xr.DataArray) and isinstance(terms, str):
             if terms == ds_terms.name:
                 das.append(ds_terms[term])
-        elif isinstance(ds_terms, xr.Dataset):
+        elif isinstance(ds_terms, (xr.Dataset, dict)):
             for term in terms:
                 if term in ds_terms:
                     das.append(ds_terms[term])
-        if len(das):
-            ds_terms[newterm] = sum(das)
-
-    def _group_processes(self, hlamdot):
+        if len(das) == 1:
+            ds_terms[newterm] = das[0]
+        elif len(das) == 2:
+            # The common case (e.g. heat + salt components) needs only a single addition
+            ds_terms[newterm] = das[0] + das[1]
+        elif len(das):
+            # A single concatenate-and-reduce, rather than a chain of pairwise additions
+            ds_terms[newterm] = xr.concat(
+                das,
+                dim="__sum__",
+                coords="minimal",
+                compat="override"
+            ).sum("__sum__", skipna=False)
+
+    def _group_processes(self, hlamdot, coords=None):
         if hlamdot is None:
             return
-        for c in hlamdot.coords:
+        for c in (hlamdot.coords if coords is None else coords):
             lambda_key = self.get_lambda_key(c.split("_")[0])
             if (lambda_key is not None):
                 if lambda_key == "density":
@@ -512,11 +783,7 @@ class WaterMassTransformations(WaterMass):
         if hlamdot is None:
             return
         
-        for proc in self.available_processes():
-            proc_list = [
-                f"{proc}{suffix}"
-                for suffix in ["_heat", "_salt"]
-            ]
+        for proc, proc_list in self._component_terms:
             self._sum_terms(
                 hlamdot,
                 proc,
@@ -534,6 +801,21 @@ class WaterMassTransformations(WaterMass):
                 )
         return hlamdot
 
+    def _combine_terms(self, transformations, sum_components=True, group_processes=False):
+        if transformations is None:
+            return
+        # Accumulate summed and grouped terms in a dictionary, so that the
+        # resulting dataset is only assembled (and aligned) once
+        terms = dict(transformations.data_vars)
+        # Group the heat and salt components of the processes first, so that the total
+        # material derivatives are then summed from the two stored component groups (a single
+        # addition per group) rather than again from all of the processes
+        if group_processes:
+            self._group_processes(terms, coords=transformations.coords)
+        if sum_components:
+            self._sum_components(terms, group_processes=group_processes)
+        return xr.Dataset(terms, coords=transformations.coords, attrs=transformations.attrs)
+
     def map_transformations(self, lambda_name, *args, **kwargs):
         """
         Wrapper function for transform_hlamdot() to group terms based
@@ -548,12 +830,11 @@ class WaterMassTransformations(WaterMass):
         transformations = self.transform_hlamdot(lambda_name, integrate=False, **kwargs)
 
         # process this function arguments
-        if sum_components:
-            transformations = self._sum_components(transformations, group_processes=group_processes)
-        if group_processes:
-            transformations = self._group_processes(transformations)
-            
-        return transformations
+        return self._combine_terms(
+            transformations,
+            sum_components=sum_components,
+            group_processes=group_processes
+        )
 
     def integrate_transformations(self, lambda_name, *args, **kwargs):
         """
@@ -588,9 +869,8 @@ class WaterMassTransformations(WaterMass):
         transformations = self.transform_hlamdot(lambda_name, integrate=True, **kwargs)
 
         # process this function arguments
-        if sum_components:
-            transformations = self._sum_components(transformations, group_processes=group_processes)
-        if group_processes:
-            transformations = self._group_processes(transformations)
-            
-        return transformations
\ No newline at end of file
+        return self._combine_terms(
+            transformations,
+            sum_components=sum_components,
+            group_processes=group_processes
+        )
\ No newline at end of file